@@ -113,7 +113,9 @@ class AICLIExecutor(ABC):
         Returns:
             True 如果目录存在且可访问
         """
-        return os.path.exists(self.target_dir) and os.path.isdir(self.target_dir)
+        # isdir 对不存在的路径同样返回 False，一次 stat 即可。
+        # 结果不做缓存：target_dir 会在运行时切换，目录也可能被删除
+        return os.path.isdir(self.target_dir)
     
     def is_available(self) -> bool:
         """检查执行器是否可用
@@ -3,6 +3,7 @@ Claude Code CLI 执行器
 
 执行 Claude Code CLI 命令，支持 Claude Code 的原生会话管理。
 """
+import functools
 import platform
 import subprocess
 import time
@@ -25,6 +26,16 @@ _INTERNAL_PARAM_KEYS = {
 _BLOCKED_CLAUDE_PARAM_KEYS = {"print", "p", "prompt"}
 
 
+@functools.lru_cache(maxsize=1)
+def _is_windows() -> bool:
+    """判断当前是否运行在 Windows 上
+    
+    运行平台在进程生命周期内不变，首次调用后缓存结果；
+    测试中 patch platform.system 前需先调用 _is_windows.cache_clear()。
+    """
+    return platform.system() == "Windows"
+
+
 class ClaudeCodeCLIExecutor(AICLIExecutor):
     """Claude Code CLI 执行器
     
@@ -77,7 +88,7 @@ class ClaudeCodeCLIExecutor(AICLIExecutor):
         Returns:
             命令名称
         """
-        return "claude.cmd" if platform.system() == "Windows" else "claude"
+        return "claude.cmd" if _is_windows() else "claude"
     
     def get_provider_name(self) -> str:
         """返回提供商名称
@@ -153,20 +164,30 @@ class ClaudeCodeCLIExecutor(AICLIExecutor):
         
         # 添加额外参数
         if additional_params:
-            for key, value in additional_params.items():
-                # 跳过内部参数
-                if key in _INTERNAL_PARAM_KEYS or key in _BLOCKED_CLAUDE_PARAM_KEYS:
-                    continue
-                
-                # 布尔参数
-                if value is True:
-                    args.append(f"--{key}")
-                # 其他参数
-                elif value is not None:
-                    args.extend([f"--{key}", str(value)])
+            self._append_extra_params(args, additional_params)
         
         return args
     
+    @staticmethod
+    def _append_extra_params(args: List[str], additional_params: Dict[str, Any]) -> None:
+        """将额外参数追加为 CLI 参数
+        
+        Args:
+            args: 待追加的命令参数列表
+            additional_params: 额外参数
+        """
+        for key, value in additional_params.items():
+            # 跳过内部参数
+            if key in _INTERNAL_PARAM_KEYS or key in _BLOCKED_CLAUDE_PARAM_KEYS:
+                continue
+            
+            # 布尔参数
+            if value is True:
+                args.append(f"--{key}")
+            # 其他参数
+            elif value is not None:
+                args.extend([f"--{key}", str(value)])
+    
     def execute(
         self,
         user_prompt: str,
@@ -1,10 +1,9 @@
 """
 消息去重缓存模块
-使用 FIFO 队列防止重复处理相同的消息
+使用定长环形缓冲区防止重复处理相同的消息
 """
 import logging
-from collections import deque
-from typing import Set
+from typing import Iterable, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
@@ -12,11 +11,15 @@ logger = logging.getLogger(__name__)
 class DeduplicationCache:
     """消息去重缓存
     
-    使用 collections.deque 实现 FIFO 队列，自动移除最早的条目。
+    使用预分配的定长环形缓冲区实现 FIFO 淘汰，写满后覆盖最早的条目。
     用于防止重复处理相同的飞书消息。
     
+    消息 ID 按原样存储和比较，缓存内部不做 strip/lower 等规范化，
+    调用方需要保证传入的 ID 已经是规范形式（飞书 message_id 本身即可）。
+    
     Attributes:
-        _cache: 存储消息 ID 的双端队列
+        _slots: 存储消息 ID 的环形缓冲区，长度固定为 max_size
+        _head: 下一个写入位置（同时也是最早条目所在的位置）
         _cache_set: 用于快速查找的集合
         max_size: 缓存的最大容量
     """
@@ -27,16 +30,21 @@ class DeduplicationCache:
         Args:
             max_size: 缓存的最大容量，默认 1000
         """
-        self._cache = deque(maxlen=max_size)
+        self._slots: List[Optional[str]] = [None] * max_size
+        self._head = 0
         self._cache_set: Set[str] = set()
         self.max_size = max_size
     
+    def __len__(self) -> int:
+        """返回当前缓存的消息数量"""
+        return len(self._cache_set)
+    
     def is_processed(self, message_id: str) -> bool:
         """检查消息是否已处理
         
         Args:
             message_id: 消息的唯一标识符
-            
+        
         Returns:
             True 如果消息已经被处理过
         """
@@ -55,15 +63,75 @@ class DeduplicationCache:
         if message_id in self._cache_set:
             return
         
-        # 如果缓存已满，deque 会自动移除最早的条目
-        # 我们需要同步更新 set
-        if len(self._cache) >= self.max_size:
-            # 获取即将被移除的最早条目
-            oldest = self._cache[0]
+        # 当前写入位置上的旧条目就是最早的条目，覆盖前从集合中移除
+        oldest = self._slots[self._head]
+        if oldest is not None:
             self._cache_set.discard(oldest)
-            logger.debug(f"Cache full, removing oldest message: {oldest}")
+            logger.debug("Cache full, removing oldest message: %s", oldest)
         
-        # 添加新消息 ID
-        self._cache.append(message_id)
+        # 写入新消息 ID 并前移写指针
+        self._slots[self._head] = message_id
         self._cache_set.add(message_id)
-        logger.debug(f"Marked message as processed: {message_id}")
+        self._head = (self._head + 1) % self.max_size
+        logger.debug("Marked message as processed: %s", message_id)
+    
+    def mark_processed_many(self, message_ids: Iterable[str]) -> None:
+        """批量标记消息为已处理
+        
+        结果与按顺序逐条调用 mark_processed 完全一致：是否重复以写入到
+        当前 ID 时的缓存内容为准，因此批次中较早写入的 ID 淘汰掉的旧条目
+        再次出现时会被重新写入。与逐条调用相比省去了每条 ID 的方法调用
+        和日志记录。
+        
+        Args:
+            message_ids: 消息 ID 序列
+        """
+        slots = self._slots
+        cache_set = self._cache_set
+        max_size = self.max_size
+        head = self._head
+        count = 0
+        try:
+            for message_id in message_ids:
+                if message_id in cache_set:
+                    continue
+                
+                # 当前写入位置上的旧条目就是最早的条目，覆盖前从集合中移除
+                oldest = slots[head]
+                if oldest is not None:
+                    cache_set.discard(oldest)
+                
+                slots[head] = message_id
+                cache_set.add(message_id)
+                head = (head + 1) % max_size
+                count += 1
+        finally:
+            # 输入迭代中途抛出异常时，写指针也要与已写入的条目保持一致
+            self._head = head
+        
+        if count:
+            logger.debug("Marked %d messages as processed", count)
+    
+    def contains_many(self, message_ids: Iterable[str]) -> List[bool]:
+        """批量检查消息是否已处理
+        
+        与 is_processed 不同，批量查询不会为每条重复消息记录日志。
+        
+        Args:
+            message_ids: 消息 ID 序列
+        
+        Returns:
+            与输入顺序一一对应的布尔列表
+        """
+        return list(map(self._cache_set.__contains__, message_ids))
+    
+    def snapshot(self) -> Set[str]:
+        """返回当前缓存内容的副本
+        
+        返回的集合与缓存相互独立，修改它不会影响缓存本身，适合一次性
+        做集合运算（如 isdisjoint / issuperset）来检查大量 ID。
+        
+        Returns:
+            当前缓存中所有消息 ID 组成的新集合
+        """
+        return set(self._cache_set)
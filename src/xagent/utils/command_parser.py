@@ -30,8 +30,40 @@ class CommandParser:
         "@qwen": ("qwen", "cli"),
     }
     
-    # CLI 关键词（中英文）
-    CLI_KEYWORDS = [
+    # 按前缀长度降序排列，优先匹配更长的前缀；长度相同时保持 PREFIX_MAPPING 中的顺序
+    _SORTED_PREFIXES = tuple(sorted(PREFIX_MAPPING, key=len, reverse=True))
+    
+    # 所有前缀合并为一个大小写不敏感的正则，一次扫描找出所有候选前缀。
+    # 每个前缀占一个分组，分组序号 - 1 即其在 _SORTED_PREFIXES 中的位置；
+    # 零宽断言要求前缀是一个完整的词（前后是空白或边界）
+    _PREFIX_PATTERN = re.compile(
+        r'(?<!\S)(?:'
+        + "|".join(f"({re.escape(prefix)})" for prefix in _SORTED_PREFIXES)
+        + r')(?!\S)',
+        re.IGNORECASE
+    )
+    
+    # 与 _SORTED_PREFIXES 一一对应的小写前缀，用于校验正则命中的片段
+    _SORTED_PREFIXES_LOWER = tuple(prefix.lower() for prefix in _SORTED_PREFIXES)
+    
+    # 与 _SORTED_PREFIXES 一一对应的 (provider, layer, 移除模式)，
+    # 移除模式大小写敏感，作用于原始消息。
+    # 类作用域中的名字在生成器表达式内部不可见，因此用 zip/map 在外层取映射值
+    _PREFIX_RULES = tuple(
+        (
+            provider,
+            layer,
+            re.compile(r'(^|\s)' + re.escape(prefix) + r'(\s|$)'),
+        )
+        for prefix, (provider, layer) in zip(
+            _SORTED_PREFIXES,
+            map(PREFIX_MAPPING.__getitem__, _SORTED_PREFIXES)
+        )
+    )
+    
+    # CLI 关键词（中英文）。使用元组：下面的关键词正则在类定义时由它编译而成，
+    # 运行时修改不会生效
+    CLI_KEYWORDS = (
         # 代码相关
         "查看代码", "view code", "分析代码", "analyze code", "代码库", "codebase",
         # 文件操作
@@ -41,7 +73,18 @@ class CommandParser:
         "执行命令", "execute command", "运行脚本", "run script",
         # 项目分析
         "分析项目", "analyze project", "项目结构", "project structure",
-    ]
+    )
+    
+    # 小写化后的 CLI 关键词，用于校验正则命中的片段
+    _CLI_KEYWORDS_LOWER = frozenset(keyword.lower() for keyword in CLI_KEYWORDS)
+    
+    # 所有 CLI 关键词合并为一个大小写不敏感的正则，一次扫描完成检测。
+    # 关键词放在前瞻断言里，每个位置都会尝试匹配：某个片段没通过下面的
+    # lower() 校验时，与它重叠的其他关键词仍然能被找到
+    _CLI_KEYWORD_PATTERN = re.compile(
+        "(?=(" + "|".join(re.escape(keyword) for keyword in CLI_KEYWORDS) + "))",
+        re.IGNORECASE
+    )
     
     def parse_command(self, message: str) -> Tuple[ParsedCommand, Dict[str, str]]:
         """解析用户消息，返回解析结果和临时参数
@@ -93,33 +136,26 @@ class CommandParser:
         Returns:
             Optional[Tuple[str, str, str]]: (provider, layer, 清理后的消息) 或 None
         """
-        # 大小写不敏感匹配
-        message_lower = message.lower()
-        
-        # 按前缀长度降序排序，优先匹配更长的前缀
-        # 这样 @claude-cli 会在 @claude 之前匹配
-        sorted_prefixes = sorted(
-            self.PREFIX_MAPPING.items(),
-            key=lambda x: len(x[0]),
-            reverse=True
+        # 一次扫描找出消息中所有完整词形式的前缀，取优先级最高（分组序号最小）的一个。
+        # IGNORECASE 的大小写折叠与 str.lower() 不完全一致（如 "İ" 可以匹配 "i"，
+        # 但 "İ".lower() 是两个码位），因此只对命中的片段再做一次 lower() 校验，
+        # 保持与按小写消息匹配时相同的结果
+        best = min(
+            (
+                match.lastindex
+                for match in self._PREFIX_PATTERN.finditer(message)
+                if match.group(0).lower() == self._SORTED_PREFIXES_LOWER[match.lastindex - 1]
+            ),
+            default=None
         )
-        
-        for prefix, (provider, layer) in sorted_prefixes:
-            # 检查消息中是否包含前缀
-            # 确保前缀是一个完整的词（前后是空格或边界）
-            prefix_lower = prefix.lower()
-            # 使用正则表达式确保前缀是一个完整的词
-            pattern = r'(^|\s)' + re.escape(prefix_lower) + r'(\s|$)'
-            
-            match = re.search(pattern, message_lower)
-            if match:
-                # 去除前缀，保留原始消息的大小写
-                # 使用正则表达式替换，确保只替换完整的词
-                pattern = r'(^|\s)' + re.escape(prefix) + r'(\s|$)'
-                final_message = re.sub(pattern, r'\1\2', message).strip()
-                return provider, layer, final_message
-        
-        return None
+        if best is None:
+            return None
+        
+        provider, layer, strip_pattern = self._PREFIX_RULES[best - 1]
+        # 去除前缀，保留原始消息的大小写
+        # 使用正则表达式替换，确保只替换完整的词
+        final_message = strip_pattern.sub(r'\1\2', message).strip()
+        return provider, layer, final_message
     
     def detect_cli_keywords(self, message: str) -> bool:
         """检测消息是否包含需要 CLI 层的关键词
@@ -130,11 +166,12 @@ class CommandParser:
         Returns:
             bool: True 如果包含 CLI 关键词
         """
-        # 大小写不敏感匹配
-        message_lower = message.lower()
-        
-        for keyword in self.CLI_KEYWORDS:
-            if keyword.lower() in message_lower:
+        # 大小写不敏感匹配，由正则的 IGNORECASE 处理，无需复制整条消息做 lower()。
+        # IGNORECASE 的大小写折叠与 str.lower() 不完全一致（如 "VİEW CODE"），
+        # 只对命中的片段再做一次 lower() 校验，保持与按小写消息匹配时相同的结果
+        for match in self._CLI_KEYWORD_PATTERN.finditer(message):
+            keyword = match.group(1)
+            if keyword.lower() in self._CLI_KEYWORDS_LOWER:
                 logger.debug(f"CLI keyword detected: '{keyword}' in message")
                 return True
         
@@ -0,0 +1,28 @@
+"""
+测试全局配置
+
+注册 Hypothesis 配置档，通过环境变量 HYPOTHESIS_PROFILE 选择：
+
+- default: Hypothesis 默认配置（每个属性测试 100 个样例）
+- ci: 30 个样例，不设 deadline，跳过 shrink 阶段；固定随机种子且不读写
+  .hypothesis 样例库，结果可复现，适合快速 CI
+- dev: 200 个样例并保留样例库，适合本地或定时任务做更充分的探索
+
+例如 `HYPOTHESIS_PROFILE=ci pytest tests/`。
+显式写了 @settings(max_examples=...) 的测试仍以测试自身的设置为准。
+"""
+import os
+
+from hypothesis import Phase, settings
+
+settings.register_profile(
+    "ci",
+    max_examples=30,
+    deadline=None,
+    derandomize=True,
+    database=None,
+    phases=[Phase.explicit, Phase.generate]
+)
+settings.register_profile("dev", max_examples=200)
+
+settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "default"))
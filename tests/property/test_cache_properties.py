@@ -0,0 +1,165 @@
+"""
+属性测试：消息去重缓存
+
+使用 Hypothesis 进行属性测试，验证 DeduplicationCache 在各种输入下的
+去重、容量限制和 FIFO 淘汰行为。批量写入和查询通过
+mark_processed_many / contains_many 完成。
+"""
+from hypothesis import given, strategies as st
+from src.xagent.utils.cache import DeduplicationCache
+
+
+# 缓存只依赖 ID 的相等性，使用短 ASCII 字符串即可覆盖，
+# 非 ASCII 的 ID 由 test_message_id_types 单独覆盖
+MESSAGE_ID = st.text(
+    alphabet=st.characters(min_codepoint=33, max_codepoint=126),
+    min_size=1,
+    max_size=16
+)
+
+# 容量测试使用的顺序 ID，模块加载时生成一次，各样例按需切片。
+# 长度覆盖 test_cache_capacity_limit 的最大写入量 1000 + 1000
+SEQUENTIAL_IDS = [f"msg_{i}" for i in range(2000)]
+
+# 批量与逐条一致性测试使用的小 ID 池，让批次内外的重复和淘汰后重现频繁出现
+SMALL_ID_POOL = [f"msg_{i}" for i in range(12)]
+
+
+class TestCacheConsistency:
+    """属性：标记后的消息一定能被查询到"""
+    
+    @given(message_id=MESSAGE_ID)
+    def test_cache_consistency_single_mark(self, message_id):
+        """属性：标记过的消息应该被识别为已处理"""
+        cache = DeduplicationCache(max_size=10)
+        
+        assert cache.is_processed(message_id) is False
+        cache.mark_processed(message_id)
+        assert cache.is_processed(message_id) is True
+    
+    @given(message_id=MESSAGE_ID)
+    def test_cache_consistency_multiple_marks(self, message_id):
+        """属性：重复标记同一消息不会影响其已处理状态，也不会占用额外容量"""
+        cache = DeduplicationCache(max_size=10)
+        
+        cache.mark_processed(message_id)
+        assert cache.is_processed(message_id) is True
+        cache.mark_processed(message_id)
+        assert cache.is_processed(message_id) is True
+        assert len(cache) == 1
+    
+    @given(
+        prefill=st.lists(st.sampled_from(SMALL_ID_POOL), max_size=30),
+        batches=st.lists(
+            st.lists(st.sampled_from(SMALL_ID_POOL), max_size=20),
+            min_size=1,
+            max_size=5
+        ),
+        max_size=st.integers(min_value=1, max_value=10)
+    )
+    def test_cache_consistency_bulk_matches_single(self, prefill, batches, max_size):
+        """属性：批量标记与逐条标记得到相同的缓存内容
+        
+        缓存预先写入部分消息，批次内和批次之间都允许重复 ID，
+        覆盖批次中较早的 ID 淘汰掉随后又出现的 ID 的情况
+        """
+        single = DeduplicationCache(max_size=max_size)
+        bulk = DeduplicationCache(max_size=max_size)
+        for message_id in prefill:
+            single.mark_processed(message_id)
+        bulk.mark_processed_many(prefill)
+        
+        for batch in batches:
+            for message_id in batch:
+                single.mark_processed(message_id)
+            bulk.mark_processed_many(batch)
+            
+            assert bulk.snapshot() == single.snapshot()
+    
+    def test_bulk_mark_re_adds_id_evicted_earlier_in_batch(self):
+        """批次中先写入的 ID 淘汰了后面要写入的 ID 时，后者应被重新写入"""
+        cache = DeduplicationCache(max_size=2)
+        cache.mark_processed_many(["a", "b"])
+        
+        cache.mark_processed_many(["c", "a"])
+        
+        assert cache.contains_many(["a", "b", "c"]) == [True, False, True]
+
+
+class TestCacheCapacity:
+    """属性：缓存容量受 max_size 限制，按 FIFO 顺序淘汰"""
+    
+    @given(
+        max_size=st.integers(min_value=1, max_value=1000),
+        extra=st.integers(min_value=1, max_value=1000)
+    )
+    def test_cache_capacity_limit(self, max_size, extra):
+        """属性：超出容量时，最早的消息被淘汰，最新的消息被保留"""
+        cache = DeduplicationCache(max_size=max_size)
+        message_ids = SEQUENTIAL_IDS[:max_size + extra]
+        
+        cache.mark_processed_many(message_ids)
+        
+        snapshot = cache.snapshot()
+        assert snapshot.isdisjoint(message_ids[:extra])
+        assert snapshot.issuperset(message_ids[extra:])
+        assert len(snapshot) == max_size
+    
+    @given(max_size=st.integers(min_value=1, max_value=1000))
+    def test_cache_capacity_at_boundary(self, max_size):
+        """属性：恰好写满时所有消息都被保留"""
+        cache = DeduplicationCache(max_size=max_size)
+        message_ids = SEQUENTIAL_IDS[:max_size]
+        
+        cache.mark_processed_many(message_ids)
+        
+        assert all(cache.contains_many(message_ids))
+    
+    @given(
+        unique_count=st.integers(min_value=1, max_value=20)
+    )
+    def test_cache_capacity_with_duplicates(self, unique_count):
+        """属性：重复消息不占用额外容量，不会导致其他消息被淘汰"""
+        cache = DeduplicationCache(max_size=unique_count)
+        message_ids = SEQUENTIAL_IDS[:unique_count]
+        
+        cache.mark_processed_many(message_ids)
+        # 再写入一轮完全重复的消息，不应淘汰任何条目
+        cache.mark_processed_many(message_ids)
+        
+        assert len(cache) == unique_count
+        assert all(cache.contains_many(message_ids))
+    
+    @given(
+        max_size=st.integers(min_value=1, max_value=50),
+        batches=st.lists(st.integers(min_value=0, max_value=30), min_size=1, max_size=5)
+    )
+    def test_cache_fifo_order(self, max_size, batches):
+        """属性：多次批量写入后，缓存中恰好保留最近写入的 max_size 条消息"""
+        cache = DeduplicationCache(max_size=max_size)
+        message_ids = []
+        for batch_size in batches:
+            batch = SEQUENTIAL_IDS[len(message_ids):len(message_ids) + batch_size]
+            cache.mark_processed_many(batch)
+            message_ids.extend(batch)
+        
+        expected = [False] * max(0, len(message_ids) - max_size) + \
+            [True] * min(len(message_ids), max_size)
+        assert cache.contains_many(message_ids) == expected
+
+
+def test_message_id_types():
+    """不同格式的消息 ID 按原样区分，互不影响"""
+    cache = DeduplicationCache(max_size=10)
+    message_ids = [
+        "om_1234567890abcdef1234567890abcdef",
+        "OM_1234567890ABCDEF1234567890ABCDEF",
+        " om_padded ",
+        "消息_001",
+        "msg-with-dash",
+    ]
+    
+    cache.mark_processed_many(message_ids)
+    
+    assert cache.contains_many(message_ids) == [True] * len(message_ids)
+    assert cache.contains_many(["om_padded", "msg_with_dash"]) == [False, False]
@@ -26,6 +26,28 @@ PREFIX_EXPECTATIONS = {
     "@qwen": ("qwen", "cli"),
 }
 
+# 复用的 Hypothesis 策略（模块级构建一次，避免每个 @given 重复构造）
+VALID_PREFIX_STRATEGY = st.sampled_from(VALID_PREFIXES)
+LEGACY_PREFIX_STRATEGY = st.sampled_from(LEGACY_PREFIXES)
+MESSAGE_TEXT = st.text(min_size=1, max_size=100)
+SHORT_MESSAGE_TEXT = st.text(min_size=1, max_size=50)
+
+
+def contains_valid_prefix(message):
+    """消息中是否含有完整词形式的有效前缀（大小写不敏感）
+    
+    解析器会在消息任意位置识别前缀并按长度优先选择，随机生成的消息里
+    如果恰好出现别的有效前缀（如 "@AGENT"），会改变路由结果和剩余消息，
+    针对指定前缀的断言需要先排除这类样例
+    """
+    return any(word.lower() in PREFIX_EXPECTATIONS for word in message.split())
+
+
+@pytest.fixture(scope="module")
+def parser():
+    """模块内共享的命令解析器，避免每个 Hypothesis 样例都重新构造"""
+    return CommandParser()
+
 
 class TestCommandPrefixProperties:
     """属性 4: 命令前缀更新
@@ -34,17 +56,16 @@ class TestCommandPrefixProperties:
     测试所有有效前缀都能成功路由，传统前缀不再被识别
     """
     
-    @settings(max_examples=100)
     @given(
-        prefix=st.sampled_from(VALID_PREFIXES),
-        message=st.text(min_size=1, max_size=100)
+        prefix=VALID_PREFIX_STRATEGY,
+        message=MESSAGE_TEXT
     )
-    def test_valid_prefixes_always_parse_successfully(self, prefix, message):
+    def test_valid_prefixes_always_parse_successfully(self, parser, prefix, message):
         """属性：所有有效前缀都应该成功解析并路由
         
         **Validates: Requirements 4.4, 4.5, 4.6, 4.7, 4.8**
         """
-        parser = CommandParser()
+        assume(not contains_valid_prefix(message))
         command = f"{prefix} {message}"
         
         parsed, params = parser.parse_command(command)
@@ -60,17 +81,16 @@ class TestCommandPrefixProperties:
         assert parsed.execution_layer == expected_layer, \
             f"前缀 {prefix} 应该路由到执行层 {expected_layer}"
     
-    @settings(max_examples=100)
     @given(
-        prefix=st.sampled_from(LEGACY_PREFIXES),
-        message=st.text(min_size=1, max_size=100)
+        prefix=LEGACY_PREFIX_STRATEGY,
+        message=MESSAGE_TEXT
     )
-    def test_legacy_prefixes_not_recognized(self, prefix, message):
+    def test_legacy_prefixes_not_recognized(self, parser, prefix, message):
         """属性：传统前缀不应该被识别
         
         **Validates: Requirements 4.1, 4.2, 4.3**
         """
-        parser = CommandParser()
+        assume(not contains_valid_prefix(message))
         command = f"{prefix} {message}"
         
         parsed, params = parser.parse_command(command)
@@ -83,15 +103,13 @@ class TestCommandPrefixProperties:
         assert prefix in parsed.message, \
             f"未识别的传统前缀 {prefix} 应该保留在消息中"
     
-    @settings(max_examples=100)
-    @given(prefix=st.sampled_from(VALID_PREFIXES))
-    def test_valid_prefixes_case_insensitive(self, prefix):
+    # 前缀只有有限的几个，直接枚举，不需要 Hypothesis 随机生成
+    @pytest.mark.parametrize("prefix", VALID_PREFIXES)
+    def test_valid_prefixes_case_insensitive(self, parser, prefix):
         """属性：前缀解析应该是大小写不敏感的
         
         **Validates: Requirements 4.4-4.8**
         """
-        parser = CommandParser()
-        
         # 测试不同大小写变体
         case_variants = [
             prefix.upper(),
@@ -118,31 +136,31 @@ class TestMessageContentPreservation:
     测试命令解析正确保留消息内容，不丢失或修改用户输入
     """
     
-    @settings(max_examples=100)
     @given(
-        prefix=st.sampled_from(VALID_PREFIXES),
+        prefix=VALID_PREFIX_STRATEGY,
         message=st.text(min_size=1, max_size=200)
     )
-    def test_message_content_preserved_after_prefix_removal(self, prefix, message):
+    def test_message_content_preserved_after_prefix_removal(self, parser, prefix, message):
         """属性：前缀移除后，消息内容应该完整保留
         
         **Validates: Requirements 4.4-4.8**
         """
+        expected_message = message.strip()
         # 跳过只包含空白字符的消息
-        assume(message.strip() != "")
+        assume(expected_message != "")
+        assume(not contains_valid_prefix(message))
         
-        parser = CommandParser()
         command = f"{prefix} {message}"
         
         parsed, params = parser.parse_command(command)
         
         # 验证消息内容被保留（去除前后空格后应该相等）
-        assert parsed.message.strip() == message.strip(), \
-            f"消息内容应该被保留: 期望 '{message.strip()}', 实际 '{parsed.message.strip()}'"
+        actual_message = parsed.message.strip()
+        assert actual_message == expected_message, \
+            f"消息内容应该被保留: 期望 '{expected_message}', 实际 '{actual_message}'"
     
-    @settings(max_examples=100)
     @given(
-        prefix=st.sampled_from(VALID_PREFIXES),
+        prefix=VALID_PREFIX_STRATEGY,
         message=st.text(
             alphabet=st.characters(
                 whitelist_categories=('Lu', 'Ll', 'Nd', 'Po', 'Zs'),
@@ -152,25 +170,25 @@ class TestMessageContentPreservation:
             max_size=100
         )
     )
-    def test_special_characters_preserved(self, prefix, message):
+    def test_special_characters_preserved(self, parser, prefix, message):
         """属性：特殊字符应该在解析后被保留
         
         **Validates: Requirements 4.4-4.8**
         """
-        assume(message.strip() != "")
+        expected_message = message.strip()
+        assume(expected_message != "")
+        assume(not contains_valid_prefix(message))
         
-        parser = CommandParser()
         command = f"{prefix} {message}"
         
         parsed, params = parser.parse_command(command)
         
         # 验证特殊字符被保留
-        assert parsed.message.strip() == message.strip(), \
+        assert parsed.message.strip() == expected_message, \
             "特殊字符应该在解析后被保留"
     
-    @settings(max_examples=100)
     @given(
-        prefix=st.sampled_from(VALID_PREFIXES),
+        prefix=VALID_PREFIX_STRATEGY,
         # 生成包含中文、日文、韩文、emoji 的文本
         message=st.text(
             alphabet=st.characters(
@@ -182,20 +200,20 @@ class TestMessageContentPreservation:
             max_size=50
         )
     )
-    def test_unicode_characters_preserved(self, prefix, message):
+    def test_unicode_characters_preserved(self, parser, prefix, message):
         """属性：Unicode 字符（中文、日文、韩文等）应该被保留
         
         **Validates: Requirements 4.4-4.8**
         """
-        assume(message.strip() != "")
+        # 字母表只有中文字符，生成的消息不会是纯空白，无需 assume 过滤
+        expected_message = message.strip()
         
-        parser = CommandParser()
         command = f"{prefix} {message}"
         
         parsed, params = parser.parse_command(command)
         
         # 验证 Unicode 字符被保留
-        assert parsed.message.strip() == message.strip(), \
+        assert parsed.message.strip() == expected_message, \
             "Unicode 字符应该在解析后被保留"
 
 
@@ -206,20 +224,20 @@ class TestWhitespaceHandling:
     测试命令解析正确处理各种空白字符情况
     """
     
-    @settings(max_examples=100)
     @given(
-        prefix=st.sampled_from(VALID_PREFIXES),
+        prefix=VALID_PREFIX_STRATEGY,
         spaces_before=st.integers(min_value=1, max_value=10),
-        message=st.text(min_size=1, max_size=50)
+        message=SHORT_MESSAGE_TEXT
     )
-    def test_multiple_spaces_after_prefix_handled(self, prefix, spaces_before, message):
+    def test_multiple_spaces_after_prefix_handled(self, parser, prefix, spaces_before, message):
         """属性：前缀后的多个空格应该被正确处理
         
         **Validates: Requirements 4.4-4.8**
         """
-        assume(message.strip() != "")
+        expected_message = message.strip()
+        assume(expected_message != "")
+        assume(not contains_valid_prefix(message))
         
-        parser = CommandParser()
         spaces = " " * spaces_before
         command = f"{prefix}{spaces}{message}"
         
@@ -229,19 +247,18 @@ class TestWhitespaceHandling:
         assert parsed.explicit is True
         
         # 验证消息内容被保留（空格被规范化）
-        assert parsed.message.strip() == message.strip()
+        assert parsed.message.strip() == expected_message
     
-    @settings(max_examples=100)
     @given(
-        prefix=st.sampled_from(VALID_PREFIXES),
-        message=st.text(min_size=1, max_size=50)
+        prefix=VALID_PREFIX_STRATEGY,
+        message=SHORT_MESSAGE_TEXT
     )
-    def test_leading_trailing_spaces_in_message_preserved(self, prefix, message):
+    def test_leading_trailing_spaces_in_message_preserved(self, parser, prefix, message):
         """属性：消息中的前导和尾随空格应该被正确处理
         
         **Validates: Requirements 4.4-4.8**
         """
-        parser = CommandParser()
+        assume(not contains_valid_prefix(message))
         command = f"{prefix} {message}"
         
         parsed, params = parser.parse_command(command)
@@ -263,20 +280,18 @@ class TestPrefixPriority:
     
     @settings(max_examples=50)
     @given(
-        first_prefix=st.sampled_from(VALID_PREFIXES),
-        second_prefix=st.sampled_from(VALID_PREFIXES),
-        message=st.text(min_size=1, max_size=50)
+        first_prefix=VALID_PREFIX_STRATEGY,
+        second_prefix=VALID_PREFIX_STRATEGY,
+        message=SHORT_MESSAGE_TEXT
     )
-    def test_first_matching_prefix_recognized(self, first_prefix, second_prefix, message):
+    def test_first_matching_prefix_recognized(self, parser, first_prefix, second_prefix, message):
         """属性：当消息包含多个前缀时，识别第一个匹配的前缀
         
         **Validates: Requirements 4.4-4.8**
         CommandParser 按长度降序排序前缀，然后按字典序排序
         第一个匹配的前缀会被识别
         """
-        assume(message.strip() != "")
-        
-        parser = CommandParser()
+        assume(not contains_valid_prefix(message))
         command = f"{first_prefix} {second_prefix} {message}"
         
         parsed, params = parser.parse_command(command)
@@ -291,7 +306,7 @@ class TestPrefixPriority:
         
         expected_prefix = None
         for prefix in sorted_prefixes:
-            if prefix in command.lower():
+            if prefix in (first_prefix, second_prefix):
                 expected_prefix = prefix
                 break
         
@@ -310,15 +325,12 @@ class TestEdgeCases:
     测试各种边缘情况下的解析行为
     """
     
-    @settings(max_examples=100)
-    @given(prefix=st.sampled_from(VALID_PREFIXES))
-    def test_prefix_only_no_message(self, prefix):
+    @given(prefix=VALID_PREFIX_STRATEGY)
+    def test_prefix_only_no_message(self, parser, prefix):
         """属性：只有前缀没有消息时，应该正确解析
         
         **Validates: Requirements 4.4-4.8**
         """
-        parser = CommandParser()
-        
         parsed, params = parser.parse_command(prefix)
         
         # 验证前缀被识别
@@ -331,17 +343,15 @@ class TestEdgeCases:
         # 消息应该为空
         assert parsed.message == ""
     
-    @settings(max_examples=100)
     @given(
-        prefix=st.sampled_from(VALID_PREFIXES),
+        prefix=VALID_PREFIX_STRATEGY,
         spaces=st.integers(min_value=1, max_value=20)
     )
-    def test_prefix_with_only_spaces(self, prefix, spaces):
+    def test_prefix_with_only_spaces(self, parser, prefix, spaces):
         """属性：前缀后只有空格时，应该正确解析
         
         **Validates: Requirements 4.4-4.8**
         """
-        parser = CommandParser()
         command = f"{prefix}{' ' * spaces}"
         
         parsed, params = parser.parse_command(command)
@@ -356,22 +366,19 @@ class TestEdgeCases:
         # 消息应该为空（空格被 strip）
         assert parsed.message == ""
     
-    @settings(max_examples=100)
     @given(
-        prefix=st.sampled_from(VALID_PREFIXES),
+        prefix=VALID_PREFIX_STRATEGY,
         position=st.integers(min_value=1, max_value=20),
-        message=st.text(min_size=1, max_size=50)
+        message=SHORT_MESSAGE_TEXT
     )
-    def test_prefix_recognized_anywhere_in_message(self, prefix, position, message):
+    def test_prefix_recognized_anywhere_in_message(self, parser, prefix, position, message):
         """属性：前缀在消息的任何位置都应该被识别（只要它是完整的词）
         
         **Validates: Requirements 4.4-4.8**
         CommandParser 会在消息的任何位置查找前缀，只要前缀是完整的词
         （前后是空格或边界）
         """
-        assume(message.strip() != "")
-        
-        parser = CommandParser()
+        assume(not contains_valid_prefix(message))
         # 在消息前添加一些字符，使前缀不在开头
         command = f"{'x' * position} {prefix} {message}"
         
@@ -393,19 +400,15 @@ class TestParsingConsistency:
     测试相同输入的解析结果应该一致
     """
     
-    @settings(max_examples=100)
     @given(
-        prefix=st.sampled_from(VALID_PREFIXES),
-        message=st.text(min_size=1, max_size=100)
+        prefix=VALID_PREFIX_STRATEGY,
+        message=MESSAGE_TEXT
     )
-    def test_parsing_is_deterministic(self, prefix, message):
+    def test_parsing_is_deterministic(self, parser, prefix, message):
         """属性：相同输入的解析结果应该一致（确定性）
         
         **Validates: Requirements 4.4-4.8**
         """
-        assume(message.strip() != "")
-        
-        parser = CommandParser()
         command = f"{prefix} {message}"
         
         # 解析两次
@@ -419,18 +422,15 @@ class TestParsingConsistency:
         assert parsed1.explicit == parsed2.explicit
         assert params1 == params2
     
-    @settings(max_examples=100)
     @given(
-        prefix=st.sampled_from(VALID_PREFIXES),
-        message=st.text(min_size=1, max_size=100)
+        prefix=VALID_PREFIX_STRATEGY,
+        message=MESSAGE_TEXT
     )
     def test_multiple_parser_instances_consistent(self, prefix, message):
         """属性：不同解析器实例的解析结果应该一致
         
         **Validates: Requirements 4.4-4.8**
         """
-        assume(message.strip() != "")
-        
         command = f"{prefix} {message}"
         
         # 创建两个解析器实例
@@ -454,13 +454,11 @@ class TestPrefixMappingCompleteness:
     测试 PREFIX_MAPPING 包含所有有效前缀，不包含传统前缀
     """
     
-    def test_all_valid_prefixes_in_mapping(self):
+    def test_all_valid_prefixes_in_mapping(self, parser):
         """属性：所有有效前缀都应该在 PREFIX_MAPPING 中
         
         **Validates: Requirements 4.4, 4.5, 4.6, 4.7, 4.8**
         """
-        parser = CommandParser()
-        
         for prefix in VALID_PREFIXES:
             assert prefix in parser.PREFIX_MAPPING, \
                 f"有效前缀 {prefix} 应该在 PREFIX_MAPPING 中"
@@ -474,24 +472,20 @@ class TestPrefixMappingCompleteness:
             assert actual_layer == expected_layer, \
                 f"前缀 {prefix} 的执行层映射应该是 {expected_layer}"
     
-    def test_no_legacy_prefixes_in_mapping(self):
+    def test_no_legacy_prefixes_in_mapping(self, parser):
         """属性：传统前缀不应该在 PREFIX_MAPPING 中
         
         **Validates: Requirements 4.1, 4.2, 4.3**
         """
-        parser = CommandParser()
-        
         for prefix in LEGACY_PREFIXES:
             assert prefix not in parser.PREFIX_MAPPING, \
                 f"传统前缀 {prefix} 不应该在 PREFIX_MAPPING 中"
     
-    def test_mapping_contains_only_expected_prefixes(self):
+    def test_mapping_contains_only_expected_prefixes(self, parser):
         """属性：PREFIX_MAPPING 应该只包含预期的前缀
         
         **Validates: Requirements 4.1-4.8**
         """
-        parser = CommandParser()
-        
         # 获取所有映射中的前缀
         actual_prefixes = set(parser.PREFIX_MAPPING.keys())
         expected_prefixes = set(VALID_PREFIXES)
@@ -1,7 +1,7 @@
 """
 Unit tests for Claude CLI Executor
 
-Tests for the Claude CLI executor, specifically focusing on the permission parameter addition.
+Tests for the Claude CLI executor, focusing on command construction and the permission parameter.
 """
 import sys
 import os
@@ -10,58 +10,114 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 import pytest
+from unittest.mock import patch
 
+from src.xagent.executors import claude_cli_executor
+from src.xagent.executors.claude_cli_executor import ClaudeCodeCLIExecutor
 
-def test_permission_parameter_in_command_args():
-    """Test that --dangerously-skip-permissions is included in command args
+
+def _make_executor(base_dir):
+    """Create an executor rooted at base_dir, with its session file inside it"""
+    base_dir.mkdir(exist_ok=True)
+    return ClaudeCodeCLIExecutor(
+        target_dir=str(base_dir),
+        session_storage_path=str(base_dir / "executor_sessions.json")
+    )
+
+
+@pytest.fixture(scope="module")
+def claude_executor(tmp_path_factory):
+    """Shared read-only executor for this module; tests that change its state build their own"""
+    return _make_executor(tmp_path_factory.mktemp("claude_cli"))
+
+
+def test_claude_command_structure(claude_executor):
+    """Test the full Claude CLI command layout from a single build_command_args call
     
-    This test directly verifies the command structure without importing the full module.
-    Validates: Requirements 2.1
+    Covers the executable name, the permission parameter right after it,
+    headless --print mode, the --add-dir target and that the prompt itself
+    is passed via stdin rather than argv.
+    Validates: Requirements 2.1, 2.3
     """
-    # Simulate the command building logic
-    command_name = "claude"
-    permission_param = "--dangerously-skip-permissions"
-    target_dir = "/test/dir"
     user_prompt = "test prompt"
+    args = claude_executor.build_command_args(user_prompt)
     
-    # Expected command structure
-    args = [
-        command_name,
-        permission_param,
-        "--add-dir", target_dir,
-        "-p", user_prompt
-    ]
+    # Executable follows the cached platform check
+    expected_command = "claude.cmd" if claude_cli_executor._is_windows() else "claude"
+    assert args[0] == expected_command
+    
+    # Permission parameter should be at index 1 (right after command name)
+    permission_param_index = args.index("--dangerously-skip-permissions")
+    assert permission_param_index == 1, \
+        f"Permission parameter should be at index 1, but found at index {permission_param_index}"
+    
+    # Headless mode and directory context follow the permission parameter
+    assert args[2] == "--print"
+    assert args[3:5] == ["--add-dir", claude_executor.target_dir]
     
-    # Verify permission parameter is included
-    assert permission_param in args
+    # The prompt is written to stdin, never placed on the command line
+    assert user_prompt not in args
+    assert "-p" not in args
+
+
+@pytest.mark.parametrize("system, expected_command", [
+    ("Windows", "claude.cmd"),
+    ("Linux", "claude"),
+    ("Darwin", "claude"),
+])
+def test_get_command_name_per_platform(claude_executor, system, expected_command):
+    """Test the executable name for each platform, resetting the cached check around the patch"""
+    claude_cli_executor._is_windows.cache_clear()
+    try:
+        with patch("platform.system", return_value=system):
+            assert claude_executor.get_command_name() == expected_command
+    finally:
+        claude_cli_executor._is_windows.cache_clear()
+
+
+def test_build_command_args_is_idempotent(claude_executor):
+    """Test that repeated calls return equal but independent args lists"""
+    params = {"model": "sonnet", "verbose": True, "prompt": "ignored", "chat_id": "oc_1"}
     
-    # Verify permission parameter is at position 1 (right after command name)
-    assert args[1] == permission_param
+    first = claude_executor.build_command_args("test prompt", params)
+    second = claude_executor.build_command_args("test prompt", params)
     
-    # Verify the complete structure
-    assert args[0] == command_name
-    assert args[2] == "--add-dir"
-    assert args[3] == target_dir
-    assert args[4] == "-p"
-    assert args[5] == user_prompt
+    assert first == second
+    assert first is not second
+    assert first == [
+        claude_executor.get_command_name(),
+        "--dangerously-skip-permissions",
+        "--print",
+        "--add-dir", claude_executor.target_dir,
+        "--model", "sonnet",
+        "--verbose",
+    ]
 
 
-def test_permission_parameter_position():
-    """Test that permission parameter is at the beginning of the command
+def test_build_command_args_follows_target_dir_change(tmp_path):
+    """Test that --add-dir follows target_dir when it is swapped at runtime"""
+    executor = _make_executor(tmp_path / "original")
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
     
-    Validates: Requirements 2.3
-    """
-    # Build a sample command
-    args = ["claude", "--dangerously-skip-permissions", "--add-dir", "/test/dir"]
+    executor.target_dir = str(other_dir)
+    args = executor.build_command_args("test prompt")
+    assert args[args.index("--add-dir") + 1] == str(other_dir)
+
+
+def test_verify_directory_rejects_missing_path_and_file(tmp_path):
+    """Test that verify_directory only accepts an existing directory"""
+    executor = _make_executor(tmp_path / "target")
+    file_path = tmp_path / "not_a_dir.txt"
+    file_path.write_text("x")
     
-    # Permission parameter should be at index 1 (right after command name)
-    permission_param_index = args.index("--dangerously-skip-permissions")
-    assert permission_param_index == 1, \
-        f"Permission parameter should be at index 1, but found at index {permission_param_index}"
+    assert executor.verify_directory() is True
+    executor.target_dir = str(tmp_path / "missing")
+    assert executor.verify_directory() is False
+    executor.target_dir = str(file_path)
+    assert executor.verify_directory() is False
 
 
 if __name__ == "__main__":
     # Run tests
-    test_permission_parameter_in_command_args()
-    test_permission_parameter_position()
-    print("All tests passed!")
+    sys.exit(pytest.main([__file__]))
@@ -8,27 +8,30 @@ from src.xagent.utils.command_parser import CommandParser
 from src.xagent.models import ParsedCommand
 
 
+@pytest.fixture(scope="module")
+def parser():
+    """模块内共享的命令解析器（解析器无可变状态）"""
+    return CommandParser()
+
+
 class TestCommandParserPrefixMapping:
     """测试命令前缀映射"""
     
-    def test_agent_prefix_in_mapping(self):
+    def test_agent_prefix_in_mapping(self, parser):
         """验证 @agent 前缀存在于映射中"""
-        parser = CommandParser()
         assert "@agent" in parser.PREFIX_MAPPING
         assert parser.PREFIX_MAPPING["@agent"] == ("agent", "api")
     
-    def test_legacy_prefixes_not_in_mapping(self):
+    def test_legacy_prefixes_not_in_mapping(self, parser):
         """验证传统 API 前缀不在映射中"""
-        parser = CommandParser()
         legacy_prefixes = ["@gpt", "@claude-api", "@gemini-api", "@openai"]
         
         for prefix in legacy_prefixes:
             assert prefix not in parser.PREFIX_MAPPING, \
                 f"传统前缀 {prefix} 不应该存在于 PREFIX_MAPPING 中"
     
-    def test_cli_prefixes_in_mapping(self):
+    def test_cli_prefixes_in_mapping(self, parser):
         """验证所有 CLI 前缀存在于映射中"""
-        parser = CommandParser()
         cli_prefixes = {
             "@claude": ("claude", "cli"),
             "@code": ("claude", "cli"),
@@ -46,9 +49,8 @@ class TestCommandParserPrefixMapping:
 class TestAgentCommandParsing:
     """测试 @agent 命令解析"""
     
-    def test_agent_command_basic(self):
+    def test_agent_command_basic(self, parser):
         """测试基本的 @agent 命令解析"""
-        parser = CommandParser()
         parsed, params = parser.parse_command("@agent 你好")
         
         assert parsed.provider == "agent"
@@ -56,9 +58,8 @@ class TestAgentCommandParsing:
         assert parsed.message == "你好"
         assert parsed.explicit is True
     
-    def test_agent_command_with_long_message(self):
+    def test_agent_command_with_long_message(self, parser):
         """测试 @agent 命令带长消息"""
-        parser = CommandParser()
         long_message = "请帮我分析这段代码的性能问题，并给出优化建议"
         parsed, params = parser.parse_command(f"@agent {long_message}")
         
@@ -67,9 +68,8 @@ class TestAgentCommandParsing:
         assert parsed.message == long_message
         assert parsed.explicit is True
     
-    def test_agent_command_case_insensitive(self):
+    def test_agent_command_case_insensitive(self, parser):
         """测试 @agent 命令大小写不敏感"""
-        parser = CommandParser()
         test_cases = ["@AGENT 你好", "@Agent 你好", "@aGeNt 你好"]
         
         for test_case in test_cases:
@@ -78,9 +78,8 @@ class TestAgentCommandParsing:
             assert parsed.execution_layer == "api"
             assert parsed.explicit is True
     
-    def test_agent_command_with_extra_spaces(self):
+    def test_agent_command_with_extra_spaces(self, parser):
         """测试 @agent 命令带额外空格"""
-        parser = CommandParser()
         parsed, params = parser.parse_command("@agent    你好")
         
         assert parsed.provider == "agent"
@@ -88,9 +87,8 @@ class TestAgentCommandParsing:
         assert parsed.message == "你好"
         assert parsed.explicit is True
     
-    def test_agent_command_with_temp_params(self):
+    def test_agent_command_with_temp_params(self, parser):
         """测试 @agent 命令带临时参数"""
-        parser = CommandParser()
         parsed, params = parser.parse_command("@agent --model=gpt-4 你好")
         
         assert parsed.provider == "agent"
@@ -103,125 +101,40 @@ class TestAgentCommandParsing:
 class TestLegacyPrefixRejection:
     """测试传统前缀不再被识别"""
     
-    def test_gpt_prefix_not_recognized(self):
-        """测试 @gpt 前缀不被识别"""
-        parser = CommandParser()
-        parsed, params = parser.parse_command("@gpt 你好")
-        
-        assert parsed.explicit is False
-        assert parsed.provider == "agent"
-        assert "@gpt" in parsed.message
-    
-    def test_claude_api_prefix_not_recognized(self):
-        """测试 @claude-api 前缀不被识别"""
-        parser = CommandParser()
-        parsed, params = parser.parse_command("@claude-api 你好")
-        
-        assert parsed.explicit is False
-        assert parsed.provider == "agent"
-        assert "@claude-api" in parsed.message
-    
-    def test_gemini_api_prefix_not_recognized(self):
-        """测试 @gemini-api 前缀不被识别"""
-        parser = CommandParser()
-        parsed, params = parser.parse_command("@gemini-api 你好")
-        
-        assert parsed.explicit is False
-        assert parsed.provider == "agent"
-        assert "@gemini-api" in parsed.message
-    
-    def test_openai_prefix_not_recognized(self):
-        """测试 @openai 前缀不被识别"""
-        parser = CommandParser()
-        parsed, params = parser.parse_command("@openai 你好")
+    @pytest.mark.parametrize("prefix", ["@gpt", "@claude-api", "@gemini-api", "@openai"])
+    def test_legacy_prefix_not_recognized(self, parser, prefix):
+        """测试传统前缀不被识别，按默认 Agent 处理并保留在消息中"""
+        parsed, params = parser.parse_command(f"{prefix} 你好")
         
-        assert parsed.explicit is False
+        assert parsed.explicit is False, \
+            f"传统前缀 {prefix} 不应该被识别为显式前缀"
         assert parsed.provider == "agent"
-        assert "@openai" in parsed.message
-    
-    def test_all_legacy_prefixes_not_recognized(self):
-        """测试所有传统前缀都不被识别"""
-        parser = CommandParser()
-        legacy_prefixes = ["@gpt", "@claude-api", "@gemini-api", "@openai"]
-        
-        for prefix in legacy_prefixes:
-            parsed, params = parser.parse_command(f"{prefix} 测试消息")
-            assert parsed.explicit is False, \
-                f"传统前缀 {prefix} 不应该被识别为显式前缀"
-            assert prefix in parsed.message, \
-                f"未识别的前缀 {prefix} 应该保留在消息中"
+        assert prefix in parsed.message, \
+            f"未识别的前缀 {prefix} 应该保留在消息中"
 
 
 class TestCliPrefixParsing:
     """测试 CLI 前缀解析"""
     
-    def test_claude_cli_prefix(self):
-        """测试 @claude 前缀解析"""
-        parser = CommandParser()
-        parsed, params = parser.parse_command("@claude 分析代码")
-        
-        assert parsed.provider == "claude"
-        assert parsed.execution_layer == "cli"
-        assert parsed.message == "分析代码"
-        assert parsed.explicit is True
-    
-    def test_code_prefix(self):
-        """测试 @code 前缀解析"""
-        parser = CommandParser()
-        parsed, params = parser.parse_command("@code 修改文件")
-        
-        assert parsed.provider == "claude"
-        assert parsed.execution_layer == "cli"
-        assert parsed.message == "修改文件"
-        assert parsed.explicit is True
-    
-    def test_gemini_cli_prefix(self):
-        """测试 @gemini 前缀解析"""
-        parser = CommandParser()
-        parsed, params = parser.parse_command("@gemini 查看项目结构")
-        
-        assert parsed.provider == "gemini"
-        assert parsed.execution_layer == "cli"
-        assert parsed.message == "查看项目结构"
-        assert parsed.explicit is True
-    
-    def test_qwen_cli_prefix(self):
-        """测试 @qwen 前缀解析"""
-        parser = CommandParser()
-        parsed, params = parser.parse_command("@qwen 执行命令")
-        
-        assert parsed.provider == "qwen"
-        assert parsed.execution_layer == "cli"
-        assert parsed.message == "执行命令"
-        assert parsed.explicit is True
-    
-    def test_all_cli_prefixes(self):
-        """测试所有 CLI 前缀都能正确解析"""
-        parser = CommandParser()
-        cli_test_cases = [
-            ("@claude", "claude", "cli"),
-            ("@code", "claude", "cli"),
-            ("@gemini", "gemini", "cli"),
-            ("@qwen", "qwen", "cli"),
-        ]
-        
-        for prefix, expected_provider, expected_layer in cli_test_cases:
-            parsed, params = parser.parse_command(f"{prefix} 测试消息")
-            assert parsed.provider == expected_provider, \
-                f"前缀 {prefix} 应该解析为提供商 {expected_provider}"
-            assert parsed.execution_layer == expected_layer, \
-                f"前缀 {prefix} 应该解析为执行层 {expected_layer}"
-            assert parsed.explicit is True, \
-                f"前缀 {prefix} 应该被识别为显式前缀"
+    @pytest.mark.parametrize("command, expected_provider, expected_message", [
+        ("@claude 分析代码", "claude", "分析代码"),
+        ("@code 修改文件", "claude", "修改文件"),
+        ("@gemini 查看项目结构", "gemini", "查看项目结构"),
+        ("@qwen 执行命令", "qwen", "执行命令"),
+    ])
+    def test_cli_prefix(self, parser, command, expected_provider, expected_message):
+        """测试每个 CLI 前缀都能正确解析"""
+        parsed, params = parser.parse_command(command)
+        
+        assert (parsed.provider, parsed.execution_layer, parsed.message, parsed.explicit) == \
+            (expected_provider, "cli", expected_message, True)
 
 
 class TestPrefixPriority:
     """测试前缀优先级"""
     
-    def test_longer_prefix_takes_priority(self):
+    def test_longer_prefix_takes_priority(self, parser):
         """测试更长的前缀优先匹配"""
-        parser = CommandParser()
-        
         parsed, params = parser.parse_command("@claude 测试")
         assert parsed.provider == "claude"
         assert parsed.execution_layer == "cli"
@@ -231,9 +144,8 @@ class TestPrefixPriority:
 class TestMessageContentPreservation:
     """测试消息内容保留"""
     
-    def test_message_content_preserved_after_prefix(self):
+    def test_message_content_preserved_after_prefix(self, parser):
         """测试前缀后的消息内容被正确保留"""
-        parser = CommandParser()
         test_cases = [
             ("@agent 你好世界", "你好世界"),
             ("@claude 分析这段代码", "分析这段代码"),
@@ -245,17 +157,15 @@ class TestMessageContentPreservation:
             assert parsed.message == expected_message, \
                 f"命令 '{command}' 的消息内容应该是 '{expected_message}'"
     
-    def test_special_characters_preserved(self):
+    def test_special_characters_preserved(self, parser):
         """测试特殊字符被保留"""
-        parser = CommandParser()
         special_message = "测试!@#$%^&*()_+-=[]{}|;':\",./<>?"
         parsed, params = parser.parse_command(f"@agent {special_message}")
         
         assert parsed.message == special_message
     
-    def test_unicode_characters_preserved(self):
+    def test_unicode_characters_preserved(self, parser):
         """测试 Unicode 字符被保留"""
-        parser = CommandParser()
         unicode_message = "你好世界 🌍 こんにちは 안녕하세요"
         parsed, params = parser.parse_command(f"@agent {unicode_message}")
         
@@ -265,9 +175,8 @@ class TestMessageContentPreservation:
 class TestDefaultBehavior:
     """测试默认行为"""
     
-    def test_no_prefix_uses_agent(self):
+    def test_no_prefix_uses_agent(self, parser):
         """测试无前缀消息使用 Agent"""
-        parser = CommandParser()
         parsed, params = parser.parse_command("你好")
         
         assert parsed.provider == "agent"
@@ -275,9 +184,8 @@ class TestDefaultBehavior:
         assert parsed.message == "你好"
         assert parsed.explicit is False
     
-    def test_unrecognized_prefix_uses_agent(self):
+    def test_unrecognized_prefix_uses_agent(self, parser):
         """测试未识别的前缀使用 Agent"""
-        parser = CommandParser()
         parsed, params = parser.parse_command("@unknown 你好")
         
         assert parsed.provider == "agent"
@@ -289,26 +197,23 @@ class TestDefaultBehavior:
 class TestEdgeCases:
     """测试边缘情况"""
     
-    def test_empty_message(self):
+    def test_empty_message(self, parser):
         """测试空消息"""
-        parser = CommandParser()
         parsed, params = parser.parse_command("")
         
         assert parsed.provider == "agent"
         assert parsed.message == ""
         assert parsed.explicit is False
     
-    def test_whitespace_only_message(self):
+    def test_whitespace_only_message(self, parser):
         """测试只有空格的消息"""
-        parser = CommandParser()
         parsed, params = parser.parse_command("   ")
         
         assert parsed.provider == "agent"
         assert parsed.explicit is False
     
-    def test_empty_message_after_prefix(self):
+    def test_empty_message_after_prefix(self, parser):
         """测试前缀后空消息"""
-        parser = CommandParser()
         parsed, params = parser.parse_command("@agent")
         
         assert parsed.provider == "agent"
@@ -316,9 +221,8 @@ class TestEdgeCases:
         assert parsed.message == ""
         assert parsed.explicit is True
     
-    def test_prefix_only_with_spaces(self):
+    def test_prefix_only_with_spaces(self, parser):
         """测试只有前缀和空格"""
-        parser = CommandParser()
         parsed, params = parser.parse_command("@agent   ")
         
         assert parsed.provider == "agent"
@@ -326,40 +230,57 @@ class TestEdgeCases:
         assert parsed.message == ""
         assert parsed.explicit is True
     
-    def test_prefix_in_middle_of_message(self):
+    def test_prefix_in_middle_of_message(self, parser):
         """测试前缀在消息中间（会被识别，因为支持任意位置匹配）"""
-        parser = CommandParser()
         parsed, params = parser.parse_command("你好 @agent 世界")
         
         assert parsed.explicit is True
         assert parsed.provider == "agent"
         assert "@agent" not in parsed.message
     
-    def test_multiple_prefixes(self):
+    def test_multiple_prefixes(self, parser):
         """测试多个前缀（只识别第一个）"""
-        parser = CommandParser()
         parsed, params = parser.parse_command("@agent @code 你好")
         
         assert parsed.provider == "agent"
         assert parsed.execution_layer == "api"
         assert parsed.explicit is True
         assert "@code" in parsed.message
+    
+    def test_prefix_with_non_ascii_case_variant_not_recognized(self, parser):
+        """测试小写化后不等于前缀的写法不被识别（如土耳其语 İ，"İ".lower() 为两个码位）"""
+        parsed, params = parser.parse_command("@GEMİNİ 你好")
+        
+        assert parsed.provider == "agent"
+        assert parsed.explicit is False
+        assert parsed.message == "@GEMİNİ 你好"
+        
+        parsed, params = parser.parse_command("@GEMİNİ @claude 你好")
+        
+        assert parsed.provider == "claude"
+        assert "@GEMİNİ" in parsed.message
+        assert "@claude" not in parsed.message
+    
+    def test_cli_keyword_with_non_ascii_case_variant_not_detected(self, parser):
+        """测试小写化后不等于关键词的写法不被识别为 CLI 关键词（如土耳其语 İ）"""
+        assert parser.detect_cli_keywords("VİEW CODE") is False
+        assert parser.detect_cli_keywords("RUN SCRİPT") is False
+        # 未通过校验的片段不影响与之重叠的其他关键词
+        assert parser.detect_cli_keywords("VİEW CODEBASE") is True
 
 
 class TestTempParams:
     """测试临时参数解析"""
     
-    def test_single_temp_param(self):
+    def test_single_temp_param(self, parser):
         """测试单个临时参数"""
-        parser = CommandParser()
         parsed, params = parser.parse_command("@agent --model=gpt-4 你好")
         
         assert params.get("model") == "gpt-4"
         assert parsed.message == "你好"
     
-    def test_multiple_temp_params(self):
+    def test_multiple_temp_params(self, parser):
         """测试多个临时参数"""
-        parser = CommandParser()
         parsed, params = parser.parse_command(
             "@agent --model=gpt-4 --temp=0.7 你好"
         )
@@ -368,9 +289,8 @@ class TestTempParams:
         assert params.get("temp") == "0.7"
         assert parsed.message == "你好"
     
-    def test_temp_param_with_spaces(self):
+    def test_temp_param_with_spaces(self, parser):
         """测试带空格的临时参数值"""
-        parser = CommandParser()
         parsed, params = parser.parse_command(
             '@agent --dir="/path/with spaces" 你好'
         )
@@ -378,9 +298,8 @@ class TestTempParams:
         assert params.get("dir") == '"/path/with'
         assert parsed.message == 'spaces" 你好'
     
-    def test_temp_params_removed_from_message(self):
+    def test_temp_params_removed_from_message(self, parser):
         """测试临时参数从消息中移除"""
-        parser = CommandParser()
         parsed, params = parser.parse_command(
             "@agent --key=value 原始消息"
         )
@@ -392,28 +311,28 @@ class TestTempParams:
 class TestCliKeywords:
     """测试 CLI 关键词检测"""
     
-    def test_cli_keywords_detection(self):
+    def test_cli_keywords_detection(self, parser):
         """测试 CLI 关键词检测"""
-        parser = CommandParser()
-        
         assert parser.detect_cli_keywords("查看代码") is True
         assert parser.detect_cli_keywords("view code") is True
         assert parser.detect_cli_keywords("分析代码") is True
         assert parser.detect_cli_keywords("修改文件") is True
         assert parser.detect_cli_keywords("执行命令") is True
     
-    def test_non_cli_keywords(self):
+    def test_non_cli_keywords(self, parser):
         """测试非 CLI 关键词"""
-        parser = CommandParser()
-        
         assert parser.detect_cli_keywords("你好") is False
         assert parser.detect_cli_keywords("什么是 AI") is False
         assert parser.detect_cli_keywords("今天天气怎么样") is False
     
-    def test_cli_keywords_case_insensitive(self):
+    def test_cli_keywords_case_insensitive(self, parser):
         """测试 CLI 关键词大小写不敏感"""
-        parser = CommandParser()
-        
         assert parser.detect_cli_keywords("VIEW CODE") is True
         assert parser.detect_cli_keywords("Analyze Code") is True
         assert parser.detect_cli_keywords("RUN SCRIPT") is True
+    
+    def test_all_cli_keywords_detected_in_sentence(self, parser):
+        """测试每个 CLI 关键词在句子中间、任意大小写下都能被检测到"""
+        for keyword in parser.CLI_KEYWORDS:
+            assert parser.detect_cli_keywords(f"请帮我 {keyword.upper()} 谢谢") is True, \
+                f"CLI 关键词 {keyword} 应该被检测到"